@@ -1,9 +1,21 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+import xxhash
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -37,43 +49,169 @@ st.markdown("""
 # DATA LOADING FUNCTIONS (Adapted for Streamlit)
 # =============================================================================
 
-@st.cache_data
+PARQUET_CACHE_DIR = Path(".cache")
+
+# Uploads kept on disk: the most recently used entries, none older than the max age
+PARQUET_CACHE_MAX_ENTRIES = 32
+PARQUET_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Calamine (Rust) parses workbooks much faster than openpyxl; fall back if absent
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    # pandas already opens openpyxl workbooks read-only with cached values
+    EXCEL_ENGINE = "openpyxl"
+
+# Label columns are always text; everything else is left to numeric inference
+_LABEL_DTYPES = {col: str for col in ['Products', 'Tourism_Industries', 'Tourism_Type',
+                                      'Visitors_Category', 'Accommodation_Type']}
+
+# Bump when parsing options change so caches written by older code are rebuilt
+PARQUET_CACHE_VERSION = 2
+
+def _upload_digest(uploaded_file):
+    """SHA-256 of an upload's bytes, read through a zero-copy buffer"""
+    with uploaded_file.getbuffer() as buffer:
+        return hashlib.sha256(buffer).hexdigest()
+
+def _parquet_cache_dir(digest):
+    """Cache directory for an upload, keyed on the digest of its bytes"""
+    return PARQUET_CACHE_DIR / f"tsa_{digest[:16]}"
+
+def _read_parquet_cache(cache_dir):
+    """Read cached sheets for an upload, or None on a cache miss"""
+    manifest_path = cache_dir / "manifest.json"
+    if not manifest_path.is_file():
+        return None
+    
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != PARQUET_CACHE_VERSION:
+            return None
+        
+        sheets = {sheet_name: pd.read_parquet(cache_dir / f"{i}.parquet")
+                  for i, sheet_name in enumerate(manifest["sheets"])}
+    except (OSError, ValueError, KeyError):
+        # A damaged cache entry is treated as a miss and rewritten
+        return None
+    
+    # Mark the entry as recently used so eviction keeps it
+    try:
+        os.utime(cache_dir)
+    except OSError:
+        pass
+    return sheets
+
+def _evict_parquet_cache():
+    """Drop cached uploads beyond the entry limit or older than the max age"""
+    try:
+        entries = sorted((entry.stat().st_mtime, entry) for entry in PARQUET_CACHE_DIR.glob("tsa_*")
+                         if entry.is_dir() and not entry.name.endswith(".tmp"))
+    except OSError:
+        return
+    
+    cutoff = datetime.now().timestamp() - PARQUET_CACHE_MAX_AGE
+    n_excess = len(entries) - PARQUET_CACHE_MAX_ENTRIES
+    for i, (mtime, entry) in enumerate(entries):
+        # Oldest first: the first n_excess entries go regardless of age
+        if i < n_excess or mtime < cutoff:
+            shutil.rmtree(entry, ignore_errors=True)
+
+def _write_parquet_cache(cache_dir, sheets):
+    """Write parsed sheets to the Parquet cache (best effort)"""
+    tmp_dir = cache_dir.with_name(cache_dir.name + ".tmp")
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for i, df in enumerate(sheets.values()):
+            df.to_parquet(tmp_dir / f"{i}.parquet", compression='zstd', engine='pyarrow')
+        
+        # The manifest is written last: a directory without one is incomplete
+        manifest = {"version": PARQUET_CACHE_VERSION, "sheets": list(sheets)}
+        (tmp_dir / "manifest.json").write_text(json.dumps(manifest))
+        
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        tmp_dir.rename(cache_dir)
+    except Exception:
+        # The cache is only an accelerator; fall back to parsing Excel next time
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    _evict_parquet_cache()
+
+def _downcast_table(df):
+    """Shrink integer column dtypes without changing any value"""
+    df = df.copy()
+    
+    # Float columns stay float64: pandas reduces float32 columns in float32,
+    # so even exactly representable values would sum differently
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    return df
+
+def _parse_tsa_sheets(uploaded_file, sheet_names):
+    """Parse the given sheets (those present) from an uploaded workbook"""
+    
+    # Spill the upload to disk in 1 MiB chunks so the Excel engine reads the
+    # file from the page cache instead of keeping a second in-memory copy
+    tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    try:
+        # Inside the try so a failed copy still removes the file
+        with tmp:
+            uploaded_file.seek(0)
+            shutil.copyfileobj(uploaded_file, tmp, 1 << 20)
+        
+        with pd.ExcelFile(tmp.name, engine=EXCEL_ENGINE) as workbook:
+            # Parse only the TSA sheets; other sheets in the workbook are skipped
+            present = [name for name in sheet_names if name in workbook.sheet_names]
+            return workbook.parse(sheet_name=present, dtype=_LABEL_DTYPES)
+    finally:
+        os.unlink(tmp.name)
+
+@st.cache_data(hash_funcs={UploadedFile: _upload_digest})
 def load_tsa_from_excel(uploaded_file):
     """Load TSA tables from uploaded Excel file"""
+    required_tables = [
+        'Table_1_Inbound_Expenditure',
+        'Table_2_Domestic_Expenditure', 
+        'Table_3_Outbound_Expenditure',
+        'Table_4_Internal_Consumption',
+        'Table_5_Production_Accounts',
+        'Table_6_Supply_Demand_Core',
+        'Table_7_Employment'
+    ]
+    
+    optional_tables = [
+        'Table_8_Capital_Formation',
+        'Table_9_Collective_Consumption',
+        'Table_10a_Trips_Overnights',
+        'Table_10b_Transport_Arrivals',
+        'Table_10c_Accommodation'
+    ]
+    
     try:
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None)
-        
-        required_tables = [
-            'Table_1_Inbound_Expenditure',
-            'Table_2_Domestic_Expenditure', 
-            'Table_3_Outbound_Expenditure',
-            'Table_4_Internal_Consumption',
-            'Table_5_Production_Accounts',
-            'Table_6_Supply_Demand_Core',
-            'Table_7_Employment'
-        ]
+        cache_dir = _parquet_cache_dir(_upload_digest(uploaded_file))
+        excel_data = _read_parquet_cache(cache_dir)
+        
+        if excel_data is None:
+            excel_data = _parse_tsa_sheets(uploaded_file, required_tables + optional_tables)
+            _write_parquet_cache(cache_dir, excel_data)
         
         tables = {}
         missing_tables = []
         
         for table_name in required_tables:
             if table_name in excel_data:
-                tables[table_name] = excel_data[table_name]
+                tables[table_name] = _downcast_table(excel_data[table_name])
             else:
                 missing_tables.append(table_name)
         
         # Load optional tables
-        optional_tables = [
-            'Table_8_Capital_Formation',
-            'Table_9_Collective_Consumption',
-            'Table_10a_Trips_Overnights',
-            'Table_10b_Transport_Arrivals',
-            'Table_10c_Accommodation'
-        ]
-        
         for table_name in optional_tables:
             if table_name in excel_data:
-                tables[table_name] = excel_data[table_name]
+                tables[table_name] = _downcast_table(excel_data[table_name])
         
         return tables, missing_tables
         
@@ -81,33 +219,245 @@ def load_tsa_from_excel(uploaded_file):
         st.error(f"Error loading Excel file: {str(e)}")
         return None, []
 
+def _check_columns(table, required_cols):
+    """Validation status for a table given the columns it must contain"""
+    missing_cols = sorted(set(required_cols).difference(table.columns))
+    return "✅ Valid" if not missing_cols else f"❌ Missing: {missing_cols}"
+
 def validate_table_structure(tables):
     """Validate that loaded tables have correct structure"""
-    validation_results = {}
+    required_columns = {
+        'Table_4': ('Table_4_Internal_Consumption',
+                    ['Products', 'Internal_Tourism_Consumption']),
+        'Table_6': ('Table_6_Supply_Demand_Core',
+                    ['Products', 'Domestic_Supply', 'Internal_Tourism_Consumption', 'Tourism_Ratio_Percent']),
+        'Table_7': ('Table_7_Employment',
+                    ['Tourism_Industries', 'Full_Time_Equivalent_Jobs'])
+    }
     
-    # Table 4 validation
-    if 'Table_4_Internal_Consumption' in tables:
-        table4 = tables['Table_4_Internal_Consumption']
-        required_cols = ['Products', 'Internal_Tourism_Consumption']
-        missing_cols = [col for col in required_cols if col not in table4.columns]
-        validation_results['Table_4'] = "✅ Valid" if not missing_cols else f"❌ Missing: {missing_cols}"
-    
-    # Table 6 validation  
-    if 'Table_6_Supply_Demand_Core' in tables:
-        table6 = tables['Table_6_Supply_Demand_Core']
-        required_cols = ['Products', 'Domestic_Supply', 'Internal_Tourism_Consumption', 'Tourism_Ratio_Percent']
-        missing_cols = [col for col in required_cols if col not in table6.columns]
-        validation_results['Table_6'] = "✅ Valid" if not missing_cols else f"❌ Missing: {missing_cols}"
-    
-    # Table 7 validation
-    if 'Table_7_Employment' in tables:
-        table7 = tables['Table_7_Employment']
-        required_cols = ['Tourism_Industries', 'Full_Time_Equivalent_Jobs']
-        missing_cols = [col for col in required_cols if col not in table7.columns]
-        validation_results['Table_7'] = "✅ Valid" if not missing_cols else f"❌ Missing: {missing_cols}"
+    validation_results = {}
+    for key, (table_name, required_cols) in required_columns.items():
+        if table_name in tables:
+            validation_results[key] = _check_columns(tables[table_name], required_cols)
     
     return validation_results
 
+# =============================================================================
+# CACHED TSA COMPUTATIONS
+# =============================================================================
+
+def _hash_values(h, values):
+    """Feed a 1-D array into a running hash"""
+    if values.dtype.kind in 'biufc':
+        # Numeric buffers are hashed in place, without a Python-level walk
+        h.update(np.ascontiguousarray(values).data)
+    elif values.dtype.kind in 'mM':
+        # Datetimes cannot be exposed as a buffer; their int64 view can
+        h.update(np.ascontiguousarray(values.view('i8')).data)
+    else:
+        h.update(pd.util.hash_array(values.astype(object)).data)
+
+def _hash_dataframe(df):
+    """Cheap content hash so identical uploads hit the cache"""
+    h = xxhash.xxh3_128()
+    h.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+    
+    # The index is part of the content: cached results carry its labels
+    if isinstance(df.index, pd.RangeIndex):
+        h.update(repr((df.index.start, df.index.stop, df.index.step)).encode())
+    else:
+        _hash_values(h, df.index.to_numpy())
+    
+    for i in range(df.shape[1]):
+        _hash_values(h, df.iloc[:, i].to_numpy())
+    
+    return h.hexdigest()
+
+_DF_HASH_FUNCS = {pd.DataFrame: _hash_dataframe, pd.Series: lambda series: _hash_dataframe(series.to_frame())}
+
+# Tourism intensity bins: right-closed intervals (0, 10], (10, 30], ... (100, 200]
+_INTENSITY_BINS = np.array([0, 10, 30, 50, 100, 200], dtype=np.float64)
+_INTENSITY_LABELS = ['Very Low (<10%)', 'Low (10-30%)', 'Medium (30-50%)', 
+                     'High (50-100%)', 'Very High (>100%)']
+
+def _nan_weighted_sums(rows, weights):
+    """Weighted row sums in one pass, skipping NaN cells like pandas' skipna"""
+    if np.isnan(rows).any() or np.isnan(weights).any():
+        rows = np.where(np.isnan(rows), 0.0, rows)
+        weights = np.where(np.isnan(weights), 0.0, weights)
+    return rows @ weights
+
+def _column_sums(df, cols):
+    """NaN-skipping totals of several columns in one reduction"""
+    values = df[cols].to_numpy()
+    if values.dtype.kind not in 'iu':
+        values = values.astype(np.float64)
+    # All-integer columns sum exactly in int64
+    return dict(zip(cols, np.nansum(values, axis=0)))
+
+def _tsa_kernel(ratio_frac, supply, taxes, gva_ratio=0.4):
+    """Estimated tourism GVA and tourism taxes from Table 6 in one pass"""
+    if taxes is None:
+        return _nan_weighted_sums(supply[np.newaxis, :], ratio_frac)[0] * gva_ratio, None
+    gva_base, tourism_taxes = _nan_weighted_sums(np.vstack([supply, taxes]), ratio_frac)
+    return gva_base * gva_ratio, tourism_taxes
+
+@st.cache_data(max_entries=16, ttl="1h", hash_funcs=_DF_HASH_FUNCS, show_spinner=False)
+def _compute_table_aggregates(table4, table7, t6_ratio_frac, t6_supply, t6_taxes):
+    """Calculate the table-level TSA aggregates (independent of country parameters)"""
+    
+    # Demand-side aggregates (one reduction over all Table 4 columns)
+    t4_cols = ['Internal_Tourism_Consumption'] + [
+        col for col in ('Inbound_Tourism_Expenditure', 'Domestic_Tourism_Expenditure')
+        if col in table4.columns
+    ]
+    sums4 = _column_sums(table4, t4_cols)
+    
+    internal_tourism_consumption = sums4['Internal_Tourism_Consumption']
+    inbound_expenditure = sums4.get('Inbound_Tourism_Expenditure', 0)
+    domestic_expenditure = sums4.get('Domestic_Tourism_Expenditure', 0)
+    
+    # Employment aggregates (one reduction over all Table 7 columns)
+    t7_cols = ['Full_Time_Equivalent_Jobs'] + (
+        ['GVA_Tourism_Share'] if 'GVA_Tourism_Share' in table7.columns else []
+    )
+    sums7 = _column_sums(table7, t7_cols)
+    total_tourism_fte = sums7['Full_Time_Equivalent_Jobs']
+    
+    # Supply-side aggregates
+    estimated_gva, weighted_taxes = _tsa_kernel(t6_ratio_frac, t6_supply, t6_taxes)
+    
+    if 'GVA_Tourism_Share' in sums7:
+        tourism_direct_gva = sums7['GVA_Tourism_Share']
+    else:
+        tourism_direct_gva = estimated_gva
+    
+    if weighted_taxes is not None:
+        tourism_taxes = weighted_taxes
+    else:
+        tourism_taxes = tourism_direct_gva * 0.15
+        
+    tourism_direct_gdp = tourism_direct_gva + tourism_taxes
+    
+    return {
+        'internal_tourism_consumption': internal_tourism_consumption,
+        'inbound_expenditure': inbound_expenditure,
+        'domestic_expenditure': domestic_expenditure,
+        'tourism_direct_gva': tourism_direct_gva,
+        'tourism_direct_gdp': tourism_direct_gdp,
+        'tourism_taxes': tourism_taxes,
+        'total_tourism_fte': total_tourism_fte
+    }
+
+def _apply_country_scaling(table_aggregates, total_gdp, total_employment, population):
+    """Add the country-relative ratios to table-level aggregates"""
+    
+    gdp, fte = table_aggregates['tourism_direct_gdp'], table_aggregates['total_tourism_fte']
+    
+    # Read-only view: the analyzer holding it is shared across sessions
+    return MappingProxyType({
+        **table_aggregates,
+        'tourism_gdp_share': (gdp / total_gdp) * 100,
+        'tourism_employment_share': (fte / total_employment) * 100,
+        'tourism_consumption_per_capita': table_aggregates['internal_tourism_consumption'] / population,
+        # GDP per tourism job in euros; empty employment data has none
+        'gdp_per_job': gdp / fte * 1000 if fte else 0.0
+    })
+
+@st.cache_data(max_entries=16, ttl="1h", hash_funcs=_DF_HASH_FUNCS, show_spinner=False)
+def _compute_tourism_ratios(table6):
+    """Analyze tourism ratios by product"""
+    
+    tourism_ratios = pd.DataFrame({
+        'Product': table6['Products'],
+        'Tourism_Ratio': table6['Tourism_Ratio_Percent'],
+        'Internal_Tourism_Consumption': table6['Internal_Tourism_Consumption'],
+        'Domestic_Supply': table6['Domestic_Supply']
+    })
+    
+    # Categorize by tourism intensity (values outside (0, 200] stay missing)
+    codes = np.searchsorted(
+        _INTENSITY_BINS, tourism_ratios['Tourism_Ratio'].to_numpy(dtype=np.float64), side='left'
+    ) - 1
+    codes[(codes < 0) | (codes >= len(_INTENSITY_LABELS))] = -1
+    tourism_ratios['Tourism_Intensity'] = pd.Categorical.from_codes(
+        codes, categories=_INTENSITY_LABELS, ordered=True
+    )
+    
+    return tourism_ratios.sort_values('Tourism_Ratio', ascending=False)
+
+@st.cache_data(max_entries=16, ttl="1h", hash_funcs=_DF_HASH_FUNCS, show_spinner=False)
+def _compute_employment_structure(table7):
+    """Analyze employment structure by industry"""
+    
+    fte = table7['Full_Time_Equivalent_Jobs'].to_numpy(dtype=np.float64)
+    employment_analysis = table7.assign(Employment_Share=fte / np.nansum(fte) * 100)
+    
+    if 'GVA_Tourism_Share' in table7.columns:
+        employment_analysis = employment_analysis.assign(
+            Labor_Productivity=table7['GVA_Tourism_Share'].to_numpy(dtype=np.float64) / fte * 1000
+        )
+    
+    return employment_analysis.sort_values('Employment_Share', ascending=False)
+
+# Upper edges of the reasonable and high tourism ratio bands
+_RATIO_CHECK_BINS = np.array([100.0, 150.0])
+
+def _count_ratio_bands(table6):
+    """Products with reasonable (<=100%), high (<=150%) and extreme tourism ratios"""
+    
+    # One binning pass: (-inf, 100] -> 0, (100, 150] -> 1, (150, inf) -> 2; NaN in none
+    ratios = table6['Tourism_Ratio_Percent'].to_numpy(dtype=np.float64, na_value=np.nan)
+    ratios = ratios[~np.isnan(ratios)]
+    return np.bincount(np.searchsorted(_RATIO_CHECK_BINS, ratios, side='left'), minlength=3)
+
+def _count_missing(column):
+    """Number of missing values in a column"""
+    if isinstance(column.dtype, np.dtype):
+        if column.dtype.kind in 'iub':
+            return 0
+        if column.dtype.kind in 'fc':
+            # One pass over the raw buffer, no boolean Series
+            return np.count_nonzero(np.isnan(column.to_numpy()))
+    # Object and pandas extension dtypes carry their own missing markers
+    return int(column.isna().sum())
+
+def _count_missing_values(table4, table6, table7):
+    """Missing values in the key column of Tables 4, 6 and 7"""
+    return (_count_missing(table4['Internal_Tourism_Consumption']),
+            _count_missing(table6['Tourism_Ratio_Percent']),
+            _count_missing(table7['Full_Time_Equivalent_Jobs']))
+
+def _consumption_discrepancy_pct(table4_total, table6_total):
+    """Table 6 consumption discrepancy as a percentage of the Table 4 total"""
+    t4, t6 = float(table4_total), float(table6_total)
+    return math.fabs(t4 - t6) / t4 * 100.0 if t4 > 0 else 0.0
+
+def _score_validation(consumption_pct_error, n_extreme, missing_counts):
+    """Validation score and issues from the precomputed check figures"""
+    
+    validation_score = 100
+    issues = []
+    
+    # Tourism consumption consistency
+    if consumption_pct_error > 1:
+        validation_score -= 25
+        issues.append(f"Tourism consumption inconsistency: {consumption_pct_error:.2f}%")
+    
+    # Tourism ratios reasonableness
+    if n_extreme > 0:
+        validation_score -= 30
+        issues.append(f"{n_extreme} products have extreme ratios (>150%)")
+    
+    # Data completeness
+    total_missing = sum(missing_counts)
+    
+    if total_missing > 0:
+        validation_score -= min(20, total_missing * 2)
+        issues.append(f"{total_missing} missing values found")
+    
+    return validation_score, issues
+
 # =============================================================================
 # TSA ANALYZER CLASS (Streamlit Adapted)
 # =============================================================================
@@ -126,144 +476,233 @@ class StreamlitTSAAnalyzer:
         self.total_employment = country_params.get('total_employment', 4000000)
         self.population = country_params.get('population', 10000000)
         
-        self.core_aggregates = {}
+        # Contiguous float64 copies of the hot Table 6 columns, ratio rescaled once
+        self._t6_ratio_frac = np.ascontiguousarray(
+            self.table6['Tourism_Ratio_Percent'].to_numpy(np.float64)
+        ) * 0.01
+        self._t6_supply = np.ascontiguousarray(self.table6['Domestic_Supply'].to_numpy(np.float64))
+        self._t6_taxes = None
+        if 'Taxes_less_Subsidies' in self.table6.columns:
+            self._t6_taxes = np.ascontiguousarray(self.table6['Taxes_less_Subsidies'].to_numpy(np.float64))
+        
+        self.core_aggregates = MappingProxyType({})
         self.tourism_ratios = pd.DataFrame()
+        self.intensity_categories = []
+        self.intensity_counts = pd.Series(dtype=np.int64)
         self.employment_analysis = pd.DataFrame()
+        self.top_ratios_10 = pd.DataFrame()
+        self.top_ratios_8 = pd.DataFrame()
+        self.top_emp_8 = pd.DataFrame()
+        self.emp_concentration = {}
+        self.leaders = {}
+        self.kpis = MappingProxyType({})
+        self.validation = None
+        self.missing_counts = (0, 0, 0)
+        self.ratio_band_counts = np.zeros(3, dtype=np.int64)
+        self.consumption_totals = (0, 0)
+        self.discrepancy_pct = 0.0
+        self.structure_validation = {}
+        self.validation_tables = MappingProxyType({})
     
     def calculate_core_aggregates(self):
         """Calculate core TSA aggregates"""
         
-        # Demand-side aggregates
-        internal_tourism_consumption = self.table4['Internal_Tourism_Consumption'].sum()
-        
-        inbound_expenditure = 0
-        domestic_expenditure = 0
-        if 'Inbound_Tourism_Expenditure' in self.table4.columns:
-            inbound_expenditure = self.table4['Inbound_Tourism_Expenditure'].sum()
-        if 'Domestic_Tourism_Expenditure' in self.table4.columns:
-            domestic_expenditure = self.table4['Domestic_Tourism_Expenditure'].sum()
-        
-        # Supply-side aggregates
-        if 'GVA_Tourism_Share' in self.table7.columns:
-            tourism_direct_gva = self.table7['GVA_Tourism_Share'].sum()
-        else:
-            tourism_ratios = self.table6['Tourism_Ratio_Percent'] / 100
-            domestic_supply = self.table6['Domestic_Supply']
-            estimated_gva_ratio = 0.4
-            tourism_direct_gva = (tourism_ratios * domestic_supply * estimated_gva_ratio).sum()
-        
-        if 'Taxes_less_Subsidies' in self.table6.columns:
-            tourism_taxes = (self.table6['Taxes_less_Subsidies'] * 
-                            self.table6['Tourism_Ratio_Percent'] / 100).sum()
-        else:
-            tourism_taxes = tourism_direct_gva * 0.15
-            
-        tourism_direct_gdp = tourism_direct_gva + tourism_taxes
-        
-        # Employment aggregates
-        total_tourism_fte = self.table7['Full_Time_Equivalent_Jobs'].sum()
-        
-        # Calculate ratios
-        tourism_gdp_share = (tourism_direct_gdp / self.total_gdp) * 100
-        tourism_employment_share = (total_tourism_fte / self.total_employment) * 100
-        tourism_consumption_per_capita = internal_tourism_consumption / self.population
-        
-        self.core_aggregates = {
-            'internal_tourism_consumption': internal_tourism_consumption,
-            'inbound_expenditure': inbound_expenditure,
-            'domestic_expenditure': domestic_expenditure,
-            'tourism_direct_gva': tourism_direct_gva,
-            'tourism_direct_gdp': tourism_direct_gdp,
-            'tourism_taxes': tourism_taxes,
-            'total_tourism_fte': total_tourism_fte,
-            'tourism_gdp_share': tourism_gdp_share,
-            'tourism_employment_share': tourism_employment_share,
-            'tourism_consumption_per_capita': tourism_consumption_per_capita
-        }
-        
+        # Table reductions are cached on the tables alone, so changing the
+        # country parameters only redoes the cheap scaling step
+        table_aggregates = _compute_table_aggregates(
+            self.table4, self.table7,
+            self._t6_ratio_frac, self._t6_supply, self._t6_taxes
+        )
+        self.core_aggregates = _apply_country_scaling(
+            table_aggregates, self.total_gdp, self.total_employment, self.population
+        )
         return self.core_aggregates
     
     def analyze_tourism_ratios(self):
         """Analyze tourism ratios by product"""
         
-        self.tourism_ratios = pd.DataFrame({
-            'Product': self.table6['Products'],
-            'Tourism_Ratio': self.table6['Tourism_Ratio_Percent'],
-            'Internal_Tourism_Consumption': self.table6['Internal_Tourism_Consumption'],
-            'Domestic_Supply': self.table6['Domestic_Supply']
-        })
+        self.tourism_ratios = _compute_tourism_ratios(self.table6)
         
-        # Categorize by tourism intensity
-        self.tourism_ratios['Tourism_Intensity'] = pd.cut(
-            self.tourism_ratios['Tourism_Ratio'], 
-            bins=[0, 10, 30, 50, 100, 200],
-            labels=['Very Low (<10%)', 'Low (10-30%)', 'Medium (30-50%)', 
-                   'High (50-100%)', 'Very High (>100%)']
-        )
-        
-        self.tourism_ratios = self.tourism_ratios.sort_values('Tourism_Ratio', ascending=False)
+        # Intensity level counts from the category codes in one pass
+        intensity = self.tourism_ratios['Tourism_Intensity'].cat
+        codes = intensity.codes.to_numpy()
+        self.intensity_categories = list(intensity.categories)
+        self.intensity_counts = pd.Series(
+            np.bincount(codes[codes >= 0], minlength=len(intensity.categories)),
+            index=intensity.categories, name='count'
+        ).sort_values(ascending=False, kind='stable')
         return self.tourism_ratios
     
     def analyze_employment_structure(self):
         """Analyze employment structure by industry"""
         
-        self.employment_analysis = self.table7.copy()
-        
-        self.employment_analysis['Employment_Share'] = (
-            self.employment_analysis['Full_Time_Equivalent_Jobs'] / 
-            self.employment_analysis['Full_Time_Equivalent_Jobs'].sum() * 100
-        )
-        
-        if 'GVA_Tourism_Share' in self.employment_analysis.columns:
-            self.employment_analysis['Labor_Productivity'] = (
-                self.employment_analysis['GVA_Tourism_Share'] / 
-                self.employment_analysis['Full_Time_Equivalent_Jobs'] * 1000
-            )
-        
-        self.employment_analysis = self.employment_analysis.sort_values(
-            'Employment_Share', ascending=False
-        )
-        
+        self.employment_analysis = _compute_employment_structure(self.table7)
         return self.employment_analysis
     
     def validate_supply_demand_balance(self):
         """Validate supply-demand balance"""
         
-        validation_score = 100
-        issues = []
-        
-        # Tourism consumption consistency
-        table4_total = self.table4['Internal_Tourism_Consumption'].sum()
-        table6_total = self.table6['Internal_Tourism_Consumption'].sum()
-        consumption_discrepancy = abs(table4_total - table6_total)
-        consumption_pct_error = (consumption_discrepancy / table4_total * 100) if table4_total > 0 else 0
-        
-        if consumption_pct_error > 1:
-            validation_score -= 25
-            issues.append(f"Tourism consumption inconsistency: {consumption_pct_error:.2f}%")
-        
-        # Tourism ratios reasonableness
-        extreme_ratios = self.table6[self.table6['Tourism_Ratio_Percent'] > 150]
-        if len(extreme_ratios) > 0:
-            validation_score -= 30
-            issues.append(f"{len(extreme_ratios)} products have extreme ratios (>150%)")
-        
-        # Data completeness
-        table4_missing = self.table4['Internal_Tourism_Consumption'].isna().sum()
-        table6_missing = self.table6['Tourism_Ratio_Percent'].isna().sum()
-        table7_missing = self.table7['Full_Time_Equivalent_Jobs'].isna().sum()
-        total_missing = table4_missing + table6_missing + table7_missing
+        # Each check figure is computed once; the page tables reuse them
+        self.missing_counts = _count_missing_values(self.table4, self.table6, self.table7)
+        self.ratio_band_counts = _count_ratio_bands(self.table6)
+        self.consumption_totals = (self.table4['Internal_Tourism_Consumption'].sum(),
+                                   self.table6['Internal_Tourism_Consumption'].sum())
+        self.discrepancy_pct = _consumption_discrepancy_pct(*self.consumption_totals)
+        self.validation = _score_validation(self.discrepancy_pct, int(self.ratio_band_counts[2]),
+                                            self.missing_counts)
+        self.structure_validation = validate_table_structure(self.tables)
+        return self.validation
+    
+    def run_core_analyses(self):
+        """Run the independent analysis phases concurrently"""
+        
+        # Each phase reads only the input tables and writes its own attribute.
+        # Workers get the script context so the cached calls work in them.
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=4, initializer=add_script_run_ctx,
+                                initargs=(None, ctx)) as executor:
+            futures = [
+                executor.submit(self.calculate_core_aggregates),
+                executor.submit(self.analyze_tourism_ratios),
+                executor.submit(self.analyze_employment_structure),
+                executor.submit(self.validate_supply_demand_balance)
+            ]
+            for future in futures:
+                future.result()
+        
+        self.materialize_top_slices()
+        self.format_kpis()
+        self.format_validation_tables()
+        return self
+    
+    def materialize_top_slices(self):
+        """Store the top-K slices the pages display, once per analyzer run"""
+        
+        # Both frames are already sorted descending
+        self.top_ratios_10 = self.tourism_ratios.iloc[:10].copy()
+        self.top_ratios_8 = self.tourism_ratios.iloc[:8].copy()
+        self.top_emp_8 = self.employment_analysis.iloc[:8].copy()
+        
+        shares = self.employment_analysis['Employment_Share'].to_numpy()
+        self.emp_concentration = {'top3': shares[:3].sum(), 'top5': shares[:5].sum()}
+        
+        # Scalar lookups of the leading industry and product, no row Series.
+        # A headers-only sheet has no leader; the pages check for the keys.
+        emp, ratios = self.employment_analysis, self.tourism_ratios
+        self.leaders = {}
+        if len(emp):
+            self.leaders['industry'] = emp.iat[0, emp.columns.get_loc('Tourism_Industries')]
+            self.leaders['industry_share'] = shares[0]
+        if len(ratios):
+            self.leaders['product'] = ratios.iat[0, ratios.columns.get_loc('Product')]
+            self.leaders['product_ratio'] = ratios.iat[0, ratios.columns.get_loc('Tourism_Ratio')]
+    
+    def format_kpis(self):
+        """Format the headline KPI strings, once per analyzer run"""
+        
+        ag = self.core_aggregates
+        self.kpis = MappingProxyType({
+            'gdp_share': f"{ag['tourism_gdp_share']:.1f}%",
+            'employment_share': f"{ag['tourism_employment_share']:.1f}%",
+            'gdp': f"€{ag['tourism_direct_gdp']:,.0f}M",
+            'fte': f"{ag['total_tourism_fte']:,.0f}",
+            'consumption': f"€{ag['internal_tourism_consumption']:,.0f}M",
+            'consumption_per_capita': f"€{ag['tourism_consumption_per_capita']:,.0f}",
+            'gdp_per_job': f"€{ag['gdp_per_job']:,.0f}",
+            'multiplier': f"{ag['internal_tourism_consumption'] / ag['tourism_direct_gdp']:.2f}",
+            'avg_ratio': f"{self.tourism_ratios['Tourism_Ratio'].mean():.1f}%"
+        })
+    
+    def format_validation_tables(self):
+        """Build the validation page tables, once per analyzer run"""
         
-        if total_missing > 0:
-            validation_score -= min(20, total_missing * 2)
-            issues.append(f"{total_missing} missing values found")
+        n4, n6, n7 = len(self.table4), len(self.table6), len(self.table7)
+        missing = np.array(self.missing_counts)
+        records = np.array([n4, n6, n7])
+        ratio_counts = self.ratio_band_counts
         
-        return validation_score, issues
+        table4_total, table6_total = self.consumption_totals
+        discrepancy = abs(table4_total - table6_total)
+        discrepancy_pct = self.discrepancy_pct
+        
+        items = list(self.structure_validation.items())
+        
+        self.validation_tables = MappingProxyType({
+            'total_missing': int(missing.sum()),
+            'n_extreme': ratio_counts[2],
+            'discrepancy_pct': discrepancy_pct,
+            'completeness': {
+                'Table': ['Table 4 (Consumption)', 'Table 6 (Supply-Demand)', 'Table 7 (Employment)'],
+                'Missing Values': missing,
+                'Total Records': records,
+                'Completeness %': (records - missing) / records * 100
+            },
+            'ratios': {
+                'Ratio Category': ['Reasonable (≤100%)', 'High (100-150%)', 'Extreme (>150%)'],
+                'Count': ratio_counts,
+                'Percentage': ratio_counts / n6 * 100
+            },
+            'consistency': {
+                'Source': ['Table 4 (Internal Consumption)', 'Table 6 (Supply-Demand)', 'Discrepancy'],
+                'Value (€M)': np.array([table4_total, table6_total, discrepancy]),
+                'Percentage': np.array([100.0, (table6_total/table4_total*100) if table4_total > 0 else 0, discrepancy_pct])
+            },
+            'structure': {
+                'Table': [table for table, _ in items],
+                'Status': ["✅ Valid" if "✅" in result else "❌ Invalid" for _, result in items],
+                'Details': [result for _, result in items]
+            }
+        })
+
+def _tables_id(tables):
+    """Content key identifying a loaded set of TSA tables"""
+    return tuple((name, _hash_dataframe(df)) for name, df in sorted(tables.items()))
+
+@st.cache_resource(max_entries=8)
+def get_analyzer(tables_id, country_params_tuple, _tables):
+    """Build a fully computed analyzer shared across reruns.
+    
+    The analyzer is a cached resource: its DataFrames are shared between
+    reruns and sessions, so treat them as read-only and ``.copy()`` before
+    mutating.
+    """
+    analyzer = StreamlitTSAAnalyzer(_tables, dict(country_params_tuple))
+    
+    # Run core calculations
+    return analyzer.run_core_analyses()
 
 # =============================================================================
 # SCENARIO ANALYSIS (Streamlit Adapted)
 # =============================================================================
 
+# Growth scenario assumptions, one entry per scenario
+_SCENARIO_NAMES = np.array(['pessimistic', 'realistic', 'optimistic'])
+_SCENARIO_GROWTH_RATE = np.array([0.01, 0.04, 0.07], dtype=np.float64)
+_SCENARIO_EMPLOYMENT_ELASTICITY = np.array([0.8, 0.9, 1.1], dtype=np.float64)
+
+# Sensitivity elasticities per parameter, as divisors of the percentage change
+# (inf: the parameter does not move employment)
+_SENSITIVITY_PARAMETERS = ["Tourism Ratios", "Labor Productivity", "Inbound Share", "Exchange Rate"]
+_SENSITIVITY_GDP_DIVISOR = np.array([100.0, 100.0, 200.0, 150.0])
+_SENSITIVITY_EMPLOYMENT_DIVISOR = np.array([np.inf, np.inf, 300.0, 400.0])
+
+def _sensitivity_kernel(base_gdp, base_employment, param_code, pct):
+    """Tourism GDP and employment after a pct change in a parameter (broadcasts)"""
+    new_gdp = base_gdp * (1 + pct / _SENSITIVITY_GDP_DIVISOR[param_code])
+    new_employment = base_employment * (1 + pct / _SENSITIVITY_EMPLOYMENT_DIVISOR[param_code])
+    return new_gdp, new_employment
+
+# Policy intervention assumptions, one entry per policy (investment cost in €M)
+_POLICY_NAMES = np.array(['marketing_boost', 'infrastructure_investment',
+                          'skills_development', 'digital_transformation'])
+_POLICY_DESCRIPTIONS = np.array(['Intensive international marketing campaign',
+                                 'Major tourism infrastructure development',
+                                 'Comprehensive workforce training program',
+                                 'Tourism sector digitalization initiative'])
+_POLICY_GDP_IMPACT = np.array([0.15, 0.25, 0.20, 0.18], dtype=np.float64)
+_POLICY_EMPLOYMENT_IMPACT = np.array([0.10, 0.20, 0.05, -0.05], dtype=np.float64)
+_POLICY_INVESTMENT_COST = np.array([50, 500, 200, 150], dtype=np.float64)
+
 class StreamlitScenarioAnalyzer:
     """Scenario analyzer adapted for Streamlit"""
     
@@ -275,35 +714,24 @@ class StreamlitScenarioAnalyzer:
     def create_growth_scenarios(self, years_ahead=5):
         """Create growth scenarios"""
         
-        scenarios = {
-            'pessimistic': {'annual_growth_rate': 0.01, 'employment_elasticity': 0.8},
-            'realistic': {'annual_growth_rate': 0.04, 'employment_elasticity': 0.9},
-            'optimistic': {'annual_growth_rate': 0.07, 'employment_elasticity': 1.1}
-        }
-        
         base_consumption = self.base_aggregates['internal_tourism_consumption']
         base_employment = self.base_aggregates['total_tourism_fte']
         base_gdp = self.base_aggregates['tourism_direct_gdp']
         
-        growth_results = {}
-        
-        for scenario_name, params in scenarios.items():
-            yearly_projections = []
-            
-            for year in range(1, years_ahead + 1):
-                projected_consumption = base_consumption * ((1 + params['annual_growth_rate']) ** year)
-                employment_growth_rate = params['annual_growth_rate'] * params['employment_elasticity']
-                projected_employment = base_employment * ((1 + employment_growth_rate) ** year)
-                projected_gdp = base_gdp * ((1 + params['annual_growth_rate']) ** year)
-                
-                yearly_projections.append({
-                    'year': 2024 + year,
-                    'tourism_consumption': projected_consumption,
-                    'tourism_employment': projected_employment,
-                    'tourism_gdp': projected_gdp
-                })
-            
-            growth_results[scenario_name] = yearly_projections
+        # Compound growth on a (scenario, year) grid
+        years = np.arange(1, years_ahead + 1)
+        growth = (1 + _SCENARIO_GROWTH_RATE[:, None]) ** years
+        employment_growth_rate = _SCENARIO_GROWTH_RATE * _SCENARIO_EMPLOYMENT_ELASTICITY
+        employment_growth = (1 + employment_growth_rate[:, None]) ** years
+        
+        # One tidy frame: a row per (scenario, year)
+        growth_results = pd.DataFrame({
+            'scenario': np.repeat(_SCENARIO_NAMES, years_ahead),
+            'year': np.tile(2024 + years, len(_SCENARIO_NAMES)),
+            'tourism_consumption': (base_consumption * growth).ravel(),
+            'tourism_employment': (base_employment * employment_growth).ravel(),
+            'tourism_gdp': (base_gdp * growth).ravel()
+        })
         
         self.scenarios['growth_scenarios'] = growth_results
         return growth_results
@@ -311,57 +739,248 @@ class StreamlitScenarioAnalyzer:
     def analyze_policy_interventions(self):
         """Analyze policy intervention impacts"""
         
-        policy_scenarios = {
-            'marketing_boost': {
-                'gdp_impact': 0.15,
-                'employment_impact': 0.10,
-                'investment_cost': 50,
-                'description': 'Intensive international marketing campaign'
-            },
-            'infrastructure_investment': {
-                'gdp_impact': 0.25,
-                'employment_impact': 0.20,
-                'investment_cost': 500,
-                'description': 'Major tourism infrastructure development'
-            },
-            'skills_development': {
-                'gdp_impact': 0.20,
-                'employment_impact': 0.05,
-                'investment_cost': 200,
-                'description': 'Comprehensive workforce training program'
-            },
-            'digital_transformation': {
-                'gdp_impact': 0.18,
-                'employment_impact': -0.05,
-                'investment_cost': 150,
-                'description': 'Tourism sector digitalization initiative'
-            }
-        }
-        
         base_gdp = self.base_aggregates['tourism_direct_gdp']
-        
-        policy_results = {}
-        for policy_name, params in policy_scenarios.items():
-            new_gdp = base_gdp * (1 + params['gdp_impact'])
-            gdp_increase = new_gdp - base_gdp
-            roi = (gdp_increase * 1000) / params['investment_cost']
-            
-            policy_results[policy_name] = {
-                'description': params['description'],
-                'gdp_change': params['gdp_impact'] * 100,
-                'employment_change': params['employment_impact'] * 100,
-                'investment_cost': params['investment_cost'],
-                'roi': roi,
-                'gdp_increase': gdp_increase
-            }
+        gdp_increase = base_gdp * _POLICY_GDP_IMPACT
+        
+        policy_results = pd.DataFrame({
+            'policy': _POLICY_NAMES,
+            'description': _POLICY_DESCRIPTIONS,
+            'gdp_change': _POLICY_GDP_IMPACT * 100,
+            'employment_change': _POLICY_EMPLOYMENT_IMPACT * 100,
+            'investment_cost': _POLICY_INVESTMENT_COST,
+            'roi': gdp_increase * 1000 / _POLICY_INVESTMENT_COST,
+            'gdp_increase': gdp_increase
+        })
         
         self.scenarios['policy_interventions'] = policy_results
         return policy_results
 
+# =============================================================================
+# CACHED CHART BUILDERS
+# =============================================================================
+# Figures are shared across reruns and sessions: render them, never mutate them.
+
+# Figures are built with graph_objects directly: plotly.express spends most of
+# its time on argument validation and DataFrame coercion for charts this small.
+
+def _pie_chart(values, names, title):
+    """Pie chart of values labelled by names"""
+    return go.Figure(go.Pie(labels=names, values=values), layout=dict(title=title))
+
+def _colored_hbar_chart(df, x, y, colorscale, title):
+    """Horizontal bars of df[x] by df[y], colored on the same continuous scale"""
+    fig = go.Figure(go.Bar(
+        x=df[x],
+        y=df[y],
+        orientation='h',
+        marker=dict(color=df[x], coloraxis='coloraxis')
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x,
+        yaxis_title=y,
+        coloraxis=dict(colorscale=colorscale, colorbar=dict(title=x)),
+        height=400
+    )
+    return fig
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_tourism_ratio_chart(top_ratios):
+    """Bar chart of the products with the highest tourism ratios"""
+    
+    return _colored_hbar_chart(top_ratios, 'Tourism_Ratio', 'Product', 'RdYlGn_r',
+                               "Tourism Intensity by Product")
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_intensity_pie_chart(intensity_counts):
+    """Pie chart of products per tourism intensity level"""
+    
+    return _pie_chart(intensity_counts.values, intensity_counts.index,
+                      "Distribution of Tourism Intensity Levels")
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_supply_consumption_chart(top_products):
+    """Grouped bars of domestic supply against tourism consumption"""
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        name='Domestic Supply',
+        x=top_products['Product'],
+        y=top_products['Domestic_Supply'],
+        opacity=0.7
+    ))
+    
+    fig.add_trace(go.Bar(
+        name='Tourism Consumption',
+        x=top_products['Product'],
+        y=top_products['Internal_Tourism_Consumption'],
+        opacity=0.7
+    ))
+    
+    fig.update_layout(
+        title="Supply vs Tourism Consumption (Top 8 Products)",
+        xaxis_title="Products",
+        yaxis_title="Value (€ millions)",
+        barmode='group'
+    )
+    return fig
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_employment_share_chart(top_industries):
+    """Bar chart of the industries with the largest employment shares"""
+    
+    return _colored_hbar_chart(top_industries, 'Employment_Share', 'Tourism_Industries', 'Blues',
+                               "Employment Share by Industry")
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_policy_chart(policy_df):
+    """ROI bars with GDP change on a second axis, one entry per policy"""
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        name='ROI',
+        x=policy_df.index,
+        y=policy_df['roi'],
+        yaxis='y',
+        marker_color='lightblue'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        name='GDP Change (%)',
+        x=policy_df.index,
+        y=policy_df['gdp_change'],
+        yaxis='y2',
+        mode='markers+lines',
+        marker_color='red',
+        marker_size=10
+    ))
+    
+    fig.update_layout(
+        title="Policy Intervention Analysis",
+        xaxis_title="Policy Intervention",
+        yaxis=dict(title="Return on Investment (x)", side="left"),
+        yaxis2=dict(title="GDP Change (%)", side="right", overlaying="y"),
+        hovermode='x'
+    )
+    return fig
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_projection_chart(scenario_df, column, baseline, baseline_name, title, y_title):
+    """One line per scenario over the forecast years, plus a dashed baseline"""
+    
+    traces = [
+        go.Scatter(x=group['year'], y=group[column], mode='lines', name=scenario)
+        for scenario, group in scenario_df.groupby('scenario', sort=False)
+    ]
+    
+    # The baseline is an ordinary trace added last, so the scenarios keep the
+    # default colors and the whole figure is laid out in one pass
+    years = scenario_df['year'].unique()
+    traces.append(go.Scatter(
+        x=[years.min(), years.max()], y=[baseline, baseline], mode='lines',
+        name=baseline_name, line=dict(color='grey', dash='dash')
+    ))
+    
+    return go.Figure(traces, layout=dict(
+        title=title,
+        xaxis_title="Year",
+        yaxis_title=y_title,
+        legend_title_text="Scenario"
+    ))
+
+# Above this many points scatters render with WebGL instead of SVG
+_WEBGL_MIN_POINTS = 1000
+
+@st.cache_resource(max_entries=32, hash_funcs=_DF_HASH_FUNCS)
+def build_productivity_scatter(emp_df):
+    """Bubble chart of FTE jobs against labor productivity, sized by employment share"""
+    
+    shares = emp_df['Employment_Share'].to_numpy(dtype=np.float64)
+    scatter = go.Scattergl if len(emp_df) >= _WEBGL_MIN_POINTS else go.Scatter
+    
+    fig = go.Figure(scatter(
+        x=emp_df['Full_Time_Equivalent_Jobs'],
+        y=emp_df['Labor_Productivity'],
+        mode='markers',
+        # Area-scaled bubbles; the largest share gets a 20px diameter
+        marker=dict(size=shares, sizemode='area', sizeref=np.nanmax(shares) / 20 ** 2),
+        text=emp_df['Tourism_Industries'],
+        hovertemplate="<b>%{text}</b><br>FTE Jobs=%{x}<br>"
+                      "Labor Productivity (€000/FTE)=%{y}<br>"
+                      "Employment Share=%{marker.size:.1f}%<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Employment vs Labor Productivity",
+        xaxis_title="FTE Jobs",
+        yaxis_title="Labor Productivity (€000/FTE)"
+    )
+    return fig
+
 # =============================================================================
 # STREAMLIT APP MAIN INTERFACE
 # =============================================================================
 
+TABLE_PREVIEW_ROWS = 200
+
+# Finding icons dropped from the plain-text report
+_REPORT_EMOJI_TRANS = str.maketrans('', '', '🔍💼📈')
+
+# Executive summary rules over the summary facts. Each finding group yields the
+# message of its first matching rule; every matching recommendation is listed.
+FINDING_RULES = (
+    # Economic impact
+    ((lambda f: f['gdp_share'] > 10,
+      "🔍 **High Economic Impact**: Tourism is a major economic driver with significant GDP and employment contributions."),
+     (lambda f: f['gdp_share'] < 3,
+      "🔍 **Growth Opportunity**: Tourism sector shows potential for expansion and development."),
+     (lambda f: True,
+      "🔍 **Balanced Development**: Tourism maintains a healthy contribution to the economy.")),
+    # Employment
+    ((lambda f: f['productivity'] > 80,
+      "💼 **High Productivity**: Tourism sector demonstrates strong labor productivity."),
+     (lambda f: True,
+      "💼 **Productivity Focus**: Opportunities exist to improve tourism labor productivity.")),
+    # Tourism ratios
+    ((lambda f: f['high_ratio_products'] > 5,
+      "📈 **High Tourism Intensity**: Multiple products show very high tourism dependency."),
+     (lambda f: f['high_ratio_products'] == 0,
+      "📈 **Balanced Tourism Ratios**: No products show extreme tourism dependency."),
+     (lambda f: True,
+      "📈 **Moderate Intensity**: Some products show high tourism specialization."))
+)
+
+RECOMMENDATION_RULES = (
+    # Based on GDP share
+    (lambda f: f['gdp_share'] > 15,
+     "🛡️ **Diversification Strategy**: Reduce tourism dependency through economic diversification"),
+    (lambda f: f['gdp_share'] > 15,
+     "💾 **Crisis Preparedness**: Develop robust crisis response and recovery plans"),
+    (lambda f: f['gdp_share'] < 5,
+     "🚀 **Growth Strategy**: Invest in tourism infrastructure and marketing to capture potential"),
+    (lambda f: f['gdp_share'] < 5,
+     "📊 **Market Development**: Focus on developing new tourism products and markets"),
+    # Based on employment concentration
+    (lambda f: f['top_3_share'] > 70,
+     "🌐 **Industry Diversification**: Develop broader range of tourism industries"),
+    # Based on productivity
+    (lambda f: f['productivity'] < 60,
+     "🎓 **Skills Development**: Invest in workforce training and capacity building"),
+    (lambda f: f['productivity'] < 60,
+     "💻 **Technology Adoption**: Implement digital solutions to improve efficiency"),
+    # Universal recommendations
+    (lambda f: True, "📈 **Continuous Monitoring**: Implement regular TSA updates for policy guidance"),
+    (lambda f: True, "🌱 **Sustainable Development**: Balance tourism growth with environmental protection")
+)
+
+DEFAULT_COUNTRY_PARAMS = MappingProxyType({
+    'country_name': 'Country',
+    'total_gdp': 200000,
+    'total_employment': 4000000,
+    'population': 10000000
+})
+
 def main():
     """Main Streamlit application"""
     
@@ -377,12 +996,7 @@ def main():
     if 'scenario_analyzer' not in st.session_state:
         st.session_state.scenario_analyzer = None
     if 'params' not in st.session_state:
-        st.session_state.params = {
-            'country_name': 'Country',
-            'total_gdp': 200000,
-            'total_employment': 4000000,
-            'population': 10000000
-        }
+        st.session_state.params = dict(DEFAULT_COUNTRY_PARAMS)
     
     # Navigation
     pages = {
@@ -477,15 +1091,6 @@ def show_home_page():
     with col2:
         st.subheader("🌍 Country Parameters")
         
-        # Initialize default parameters if not set
-        if 'params' not in st.session_state:
-            st.session_state.params = {
-                'country_name': 'Country',
-                'total_gdp': 200000,
-                'total_employment': 4000000,
-                'population': 10000000
-            }
-        
         with st.form("country_params_form"):
             country_name = st.text_input("Country Name", value=st.session_state.params['country_name'])
             total_gdp = st.number_input("Total GDP (€ millions)", value=st.session_state.params['total_gdp'], min_value=1000)
@@ -504,19 +1109,15 @@ def show_home_page():
                 st.success("✅ Country parameters set!")
     
     # Initialize analyzer
-    if st.session_state.tables is not None and 'params' in st.session_state:
+    if st.session_state.tables is not None:
         if st.button("🚀 Initialize TSA Analyzer", type="primary"):
             with st.spinner("Initializing analyzer..."):
-                analyzer = StreamlitTSAAnalyzer(
-                    st.session_state.tables, 
-                    st.session_state.params
+                analyzer = get_analyzer(
+                    _tables_id(st.session_state.tables),
+                    tuple(sorted(st.session_state.params.items())),
+                    st.session_state.tables
                 )
                 
-                # Run core calculations
-                analyzer.calculate_core_aggregates()
-                analyzer.analyze_tourism_ratios()
-                analyzer.analyze_employment_structure()
-                
                 st.session_state.analyzer = analyzer
                 st.success("✅ TSA Analyzer initialized! Navigate to other pages for analysis.")
 
@@ -529,6 +1130,7 @@ def show_core_analysis():
     
     analyzer = st.session_state.analyzer
     aggregates = analyzer.core_aggregates
+    kpis = analyzer.kpis
     
     st.title("📊 Core TSA Aggregates Analysis")
     st.subheader(f"Country: {analyzer.country_name}")
@@ -539,28 +1141,28 @@ def show_core_analysis():
     with col1:
         st.metric(
             "Tourism GDP Share",
-            f"{aggregates['tourism_gdp_share']:.1f}%",
+            kpis['gdp_share'],
             help="Tourism's contribution to total GDP"
         )
     
     with col2:
         st.metric(
             "Tourism Employment Share", 
-            f"{aggregates['tourism_employment_share']:.1f}%",
+            kpis['employment_share'],
             help="Tourism's share of total employment"
         )
     
     with col3:
         st.metric(
             "Tourism GDP",
-            f"€{aggregates['tourism_direct_gdp']:,.0f}M",
+            kpis['gdp'],
             help="Tourism direct contribution to GDP"
         )
     
     with col4:
         st.metric(
             "Tourism Employment",
-            f"{aggregates['total_tourism_fte']:,.0f}",
+            kpis['fte'],
             help="Full-time equivalent tourism jobs"
         )
     
@@ -582,11 +1184,8 @@ def show_core_analysis():
         }
         
         if demand_data['Value (€M)'][1] > 0 or demand_data['Value (€M)'][2] > 0:
-            fig = px.pie(
-                values=demand_data['Value (€M)'][1:],
-                names=demand_data['Component'][1:],
-                title="Tourism Expenditure Breakdown"
-            )
+            fig = _pie_chart(demand_data['Value (€M)'][1:], demand_data['Component'][1:],
+                             "Tourism Expenditure Breakdown")
             st.plotly_chart(fig, use_container_width=True)
         
         st.dataframe(pd.DataFrame(demand_data), hide_index=True)
@@ -603,11 +1202,8 @@ def show_core_analysis():
             ]
         }
         
-        fig = px.bar(
-            x=supply_data['Component'],
-            y=supply_data['Value (€M)'],
-            title="Tourism GDP Components"
-        )
+        fig = go.Figure(go.Bar(x=supply_data['Component'], y=supply_data['Value (€M)']),
+                        layout=dict(title="Tourism GDP Components"))
         st.plotly_chart(fig, use_container_width=True)
         
         st.dataframe(pd.DataFrame(supply_data), hide_index=True)
@@ -620,23 +1216,21 @@ def show_core_analysis():
     with col1:
         st.metric(
             "Tourism Consumption per Capita",
-            f"€{aggregates['tourism_consumption_per_capita']:,.0f}",
+            kpis['consumption_per_capita'],
             help="Annual tourism consumption per resident"
         )
     
     with col2:
-        gdp_intensity = aggregates['tourism_direct_gdp'] / aggregates['total_tourism_fte'] * 1000
         st.metric(
             "GDP per Tourism Job",
-            f"€{gdp_intensity:,.0f}",
+            kpis['gdp_per_job'],
             help="Tourism GDP per FTE job"
         )
     
     with col3:
-        tourism_multiplier = aggregates['internal_tourism_consumption'] / aggregates['tourism_direct_gdp']
         st.metric(
             "Tourism Multiplier",
-            f"{tourism_multiplier:.2f}",
+            kpis['multiplier'],
             help="Consumption to GDP ratio"
         )
 
@@ -660,8 +1254,7 @@ def show_tourism_ratios():
         st.metric("Products Analyzed", len(ratios_df))
     
     with col2:
-        avg_ratio = ratios_df['Tourism_Ratio'].mean()
-        st.metric("Average Tourism Ratio", f"{avg_ratio:.1f}%")
+        st.metric("Average Tourism Ratio", analyzer.kpis['avg_ratio'])
     
     with col3:
         high_ratio_products = (ratios_df['Tourism_Ratio'] > 50).sum()
@@ -679,33 +1272,31 @@ def show_tourism_ratios():
     with col1:
         st.subheader("Top 10 Products by Tourism Ratio")
         
-        top_ratios = ratios_df.head(10)
+        top_ratios = analyzer.top_ratios_10
         
-        fig = px.bar(
-            top_ratios,
-            x='Tourism_Ratio',
-            y='Product',
-            orientation='h',
-            color='Tourism_Ratio',
-            color_continuous_scale='RdYlGn_r',
-            title="Tourism Intensity by Product"
-        )
-        fig.update_layout(height=400)
+        fig = build_tourism_ratio_chart(top_ratios)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("Tourism Intensity Distribution")
         
-        intensity_counts = ratios_df['Tourism_Intensity'].value_counts()
-        
-        fig = px.pie(
-            values=intensity_counts.values,
-            names=intensity_counts.index,
-            title="Distribution of Tourism Intensity Levels"
-        )
+        fig = build_intensity_pie_chart(analyzer.intensity_counts)
         st.plotly_chart(fig, use_container_width=True)
     
-    # Detailed table
+    render_ratio_table(ratios_df, analyzer.intensity_categories)
+    
+    # Supply vs Tourism Consumption
+    st.subheader("Supply vs Tourism Consumption")
+    
+    top_products = analyzer.top_ratios_8
+    
+    fig = build_supply_consumption_chart(top_products)
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_ratio_table(ratios_df, intensity_categories):
+    """Filterable tourism ratios table (reruns only on its own widgets)"""
+    
     st.subheader("Detailed Tourism Ratios")
     
     # Filters
@@ -717,7 +1308,7 @@ def show_tourism_ratios():
     with col2:
         intensity_filter = st.selectbox(
             "Filter by Intensity", 
-            ['All'] + list(ratios_df['Tourism_Intensity'].cat.categories)
+            ['All'] + intensity_categories
         )
     
     # Apply filters
@@ -726,40 +1317,16 @@ def show_tourism_ratios():
     if intensity_filter != 'All':
         filtered_df = filtered_df[filtered_df['Tourism_Intensity'] == intensity_filter]
     
+    # Only a preview is sent to the browser unless all rows are requested
+    show_all = st.checkbox("Show all rows")
+    if not show_all and len(filtered_df) > TABLE_PREVIEW_ROWS:
+        st.caption(f"Showing the first {TABLE_PREVIEW_ROWS} of {len(filtered_df)} products.")
+        filtered_df = filtered_df.head(TABLE_PREVIEW_ROWS)
+    
     st.dataframe(
         filtered_df[['Product', 'Tourism_Ratio', 'Internal_Tourism_Consumption', 'Tourism_Intensity']],
         use_container_width=True
     )
-    
-    # Supply vs Tourism Consumption
-    st.subheader("Supply vs Tourism Consumption")
-    
-    top_products = ratios_df.head(8)
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        name='Domestic Supply',
-        x=top_products['Product'],
-        y=top_products['Domestic_Supply'],
-        opacity=0.7
-    ))
-    
-    fig.add_trace(go.Bar(
-        name='Tourism Consumption',
-        x=top_products['Product'],
-        y=top_products['Internal_Tourism_Consumption'],
-        opacity=0.7
-    ))
-    
-    fig.update_layout(
-        title="Supply vs Tourism Consumption (Top 8 Products)",
-        xaxis_title="Products",
-        yaxis_title="Value (€ millions)",
-        barmode='group'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
 def show_employment_analysis():
     """Employment analysis page"""
@@ -786,8 +1353,8 @@ def show_employment_analysis():
         st.metric("Total FTE Employment", f"{total_fte:,.0f}")
     
     with col3:
-        top_industry_share = emp_df.iloc[0]['Employment_Share']
-        st.metric("Largest Industry Share", f"{top_industry_share:.1f}%")
+        if 'industry_share' in analyzer.leaders:
+            st.metric("Largest Industry Share", f"{analyzer.leaders['industry_share']:.1f}%")
     
     with col4:
         if 'Labor_Productivity' in emp_df.columns:
@@ -802,37 +1369,25 @@ def show_employment_analysis():
     with col1:
         st.subheader("Employment by Tourism Industry")
         
-        top_industries = emp_df.head(8)
+        top_industries = analyzer.top_emp_8
         
-        fig = px.bar(
-            top_industries,
-            x='Employment_Share',
-            y='Tourism_Industries',
-            orientation='h',
-            color='Employment_Share',
-            color_continuous_scale='Blues',
-            title="Employment Share by Industry"
-        )
-        fig.update_layout(height=400)
+        fig = build_employment_share_chart(top_industries)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.subheader("Employment Concentration")
         
         # Calculate concentration metrics
-        top_3_share = emp_df.head(3)['Employment_Share'].sum()
-        top_5_share = emp_df.head(5)['Employment_Share'].sum()
+        top_3_share = analyzer.emp_concentration['top3']
+        top_5_share = analyzer.emp_concentration['top5']
         
         concentration_data = {
             'Metric': ['Top 3 Industries', 'Top 5 Industries', 'Remaining Industries'],
             'Share': [top_3_share, top_5_share - top_3_share, 100 - top_5_share]
         }
         
-        fig = px.pie(
-            values=concentration_data['Share'],
-            names=concentration_data['Metric'],
-            title="Employment Concentration"
-        )
+        fig = _pie_chart(concentration_data['Share'], concentration_data['Metric'],
+                         "Employment Concentration")
         st.plotly_chart(fig, use_container_width=True)
     
     # Detailed employment table
@@ -855,18 +1410,7 @@ def show_employment_analysis():
     if 'Labor_Productivity' in emp_df.columns:
         st.subheader("Employment vs Productivity Analysis")
         
-        fig = px.scatter(
-            emp_df,
-            x='Full_Time_Equivalent_Jobs',
-            y='Labor_Productivity',
-            size='Employment_Share',
-            hover_name='Tourism_Industries',
-            title="Employment vs Labor Productivity",
-            labels={
-                'Full_Time_Equivalent_Jobs': 'FTE Jobs',
-                'Labor_Productivity': 'Labor Productivity (€000/FTE)'
-            }
-        )
+        fig = build_productivity_scatter(emp_df)
         st.plotly_chart(fig, use_container_width=True)
 
 def show_scenario_analysis():
@@ -881,8 +1425,9 @@ def show_scenario_analysis():
     st.title("🔮 Scenario Analysis & Forecasting")
     st.subheader(f"Country: {analyzer.country_name}")
     
-    # Initialize scenario analyzer
-    if st.session_state.scenario_analyzer is None:
+    # Initialize scenario analyzer (rebuilt when the analyzer is re-initialized)
+    if (st.session_state.scenario_analyzer is None
+            or st.session_state.scenario_analyzer.base_analyzer is not analyzer):
         st.session_state.scenario_analyzer = StreamlitScenarioAnalyzer(analyzer)
     
     scenario_analyzer = st.session_state.scenario_analyzer
@@ -891,209 +1436,155 @@ def show_scenario_analysis():
     tab1, tab2, tab3 = st.tabs(["📈 Growth Scenarios", "🏛️ Policy Interventions", "📊 Sensitivity Analysis"])
     
     with tab1:
-        st.subheader("Tourism Growth Scenarios")
-        
-        years_ahead = st.slider("Forecast Period (years)", 3, 10, 5)
-        
-        if st.button("Generate Growth Scenarios"):
-            with st.spinner("Creating growth scenarios..."):
-                growth_results = scenario_analyzer.create_growth_scenarios(years_ahead)
-                
-                # Visualize growth scenarios
-                scenario_data = []
-                
-                for scenario_name, projections in growth_results.items():
-                    for proj in projections:
-                        scenario_data.append({
-                            'Year': proj['year'],
-                            'Scenario': scenario_name.title(),
-                            'Tourism_GDP': proj['tourism_gdp'],
-                            'Tourism_Employment': proj['tourism_employment'],
-                            'Tourism_Consumption': proj['tourism_consumption']
-                        })
-                
-                scenario_df = pd.DataFrame(scenario_data)
-                
-                # GDP projection chart
-                fig = px.line(
-                    scenario_df,
-                    x='Year',
-                    y='Tourism_GDP',
-                    color='Scenario',
-                    title="Tourism GDP Growth Projections",
-                    labels={'Tourism_GDP': 'Tourism GDP (€ millions)'}
-                )
-                
-                # Add current year baseline
-                current_gdp = analyzer.core_aggregates['tourism_direct_gdp']
-                fig.add_hline(y=current_gdp, line_dash="dash", 
-                             annotation_text="Current GDP", annotation_position="bottom right")
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Employment projection chart
-                fig = px.line(
-                    scenario_df,
-                    x='Year',
-                    y='Tourism_Employment',
-                    color='Scenario',
-                    title="Tourism Employment Growth Projections",
-                    labels={'Tourism_Employment': 'Tourism Employment (FTE)'}
-                )
-                
-                current_employment = analyzer.core_aggregates['total_tourism_fte']
-                fig.add_hline(y=current_employment, line_dash="dash",
-                             annotation_text="Current Employment", annotation_position="bottom right")
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Summary table
-                st.subheader("Growth Scenario Summary")
-                
-                summary_data = []
-                for scenario_name, projections in growth_results.items():
-                    final_year = projections[-1]
-                    gdp_growth = ((final_year['tourism_gdp'] / current_gdp) - 1) * 100
-                    emp_growth = ((final_year['tourism_employment'] / current_employment) - 1) * 100
-                    
-                    summary_data.append({
-                        'Scenario': scenario_name.title(),
-                        f'{years_ahead}-Year GDP Growth (%)': f"{gdp_growth:.1f}%",
-                        f'{years_ahead}-Year Employment Growth (%)': f"{emp_growth:.1f}%",
-                        f'Final GDP (€M)': f"{final_year['tourism_gdp']:,.0f}",
-                        f'Final Employment': f"{final_year['tourism_employment']:,.0f}"
-                    })
-                
-                st.dataframe(pd.DataFrame(summary_data), hide_index=True)
+        render_growth_scenarios(analyzer, scenario_analyzer)
     
     with tab2:
-        st.subheader("Policy Intervention Analysis")
-        
-        if st.button("Analyze Policy Interventions"):
-            with st.spinner("Analyzing policy impacts..."):
-                policy_results = scenario_analyzer.analyze_policy_interventions()
-                
-                # Policy comparison chart
-                policies = list(policy_results.keys())
-                roi_values = [policy_results[p]['roi'] for p in policies]
-                gdp_changes = [policy_results[p]['gdp_change'] for p in policies]
-                investment_costs = [policy_results[p]['investment_cost'] for p in policies]
-                
-                fig = go.Figure()
-                
-                fig.add_trace(go.Bar(
-                    name='ROI',
-                    x=[p.replace('_', ' ').title() for p in policies],
-                    y=roi_values,
-                    yaxis='y',
-                    marker_color='lightblue'
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    name='GDP Change (%)',
-                    x=[p.replace('_', ' ').title() for p in policies],
-                    y=gdp_changes,
-                    yaxis='y2',
-                    mode='markers+lines',
-                    marker_color='red',
-                    marker_size=10
-                ))
-                
-                fig.update_layout(
-                    title="Policy Intervention Analysis",
-                    xaxis_title="Policy Intervention",
-                    yaxis=dict(title="Return on Investment (x)", side="left"),
-                    yaxis2=dict(title="GDP Change (%)", side="right", overlaying="y"),
-                    hovermode='x'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Policy details table
-                st.subheader("Policy Intervention Details")
-                
-                policy_table_data = []
-                for policy_name, data in policy_results.items():
-                    policy_table_data.append({
-                        'Policy': policy_name.replace('_', ' ').title(),
-                        'Description': data['description'],
-                        'GDP Change (%)': f"{data['gdp_change']:+.1f}%",
-                        'Employment Change (%)': f"{data['employment_change']:+.1f}%",
-                        'Investment Cost (€M)': f"{data['investment_cost']:.0f}",
-                        'ROI': f"{data['roi']:.1f}x"
-                    })
-                
-                st.dataframe(pd.DataFrame(policy_table_data), hide_index=True)
-                
-                # Recommendations
-                st.subheader("Policy Recommendations")
-                
-                best_roi_policy = max(policy_results.items(), key=lambda x: x[1]['roi'])
-                best_gdp_policy = max(policy_results.items(), key=lambda x: x[1]['gdp_change'])
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.success(f"**Highest ROI**: {best_roi_policy[0].replace('_', ' ').title()}")
-                    st.write(f"ROI: {best_roi_policy[1]['roi']:.1f}x")
-                    st.write(f"GDP Impact: {best_roi_policy[1]['gdp_change']:+.1f}%")
-                
-                with col2:
-                    st.info(f"**Highest GDP Impact**: {best_gdp_policy[0].replace('_', ' ').title()}")
-                    st.write(f"GDP Impact: {best_gdp_policy[1]['gdp_change']:+.1f}%")
-                    st.write(f"ROI: {best_gdp_policy[1]['roi']:.1f}x")
+        render_policy_interventions(scenario_analyzer)
     
     with tab3:
-        st.subheader("Sensitivity Analysis")
-        st.write("Analyze how changes in key parameters affect tourism outcomes.")
-        
-        # Parameter selection
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            param_change = st.slider("Parameter Change (%)", -30, 30, 10)
-        
-        with col2:
-            parameter = st.selectbox(
-                "Select Parameter",
-                ["Tourism Ratios", "Labor Productivity", "Inbound Share", "Exchange Rate"]
+        render_sensitivity_analysis(analyzer)
+
+@st.fragment
+def render_growth_scenarios(analyzer, scenario_analyzer):
+    """Growth scenarios panel (reruns only on its own widgets)"""
+    
+    st.subheader("Tourism Growth Scenarios")
+    
+    years_ahead = st.slider("Forecast Period (years)", 3, 10, 5)
+    
+    if st.button("Generate Growth Scenarios"):
+        with st.spinner("Creating growth scenarios..."):
+            growth_results = scenario_analyzer.create_growth_scenarios(years_ahead)
+            scenario_df = growth_results.assign(scenario=growth_results['scenario'].str.title())
+            
+            # GDP projection chart, with the current year as a dashed baseline
+            current_gdp = analyzer.core_aggregates['tourism_direct_gdp']
+            fig = build_projection_chart(
+                scenario_df, 'tourism_gdp', current_gdp, "Current GDP",
+                "Tourism GDP Growth Projections", "Tourism GDP (€ millions)"
             )
-        
-        if st.button("Run Sensitivity Analysis"):
-            base_gdp = analyzer.core_aggregates['tourism_direct_gdp']
-            base_employment = analyzer.core_aggregates['total_tourism_fte']
+            st.plotly_chart(fig, use_container_width=True)
             
-            # Simple sensitivity calculation
-            if parameter == "Tourism Ratios":
-                new_gdp = base_gdp * (1 + param_change / 100)
-                new_employment = base_employment
-            elif parameter == "Labor Productivity":
-                new_gdp = base_gdp * (1 + param_change / 100)
-                new_employment = base_employment
-            elif parameter == "Inbound Share":
-                new_gdp = base_gdp * (1 + param_change / 200)  # 50% effect
-                new_employment = base_employment * (1 + param_change / 300)  # 33% effect
-            else:  # Exchange Rate
-                new_gdp = base_gdp * (1 + param_change / 150)  # 67% effect
-                new_employment = base_employment * (1 + param_change / 400)  # 25% effect
+            # Employment projection chart
+            current_employment = analyzer.core_aggregates['total_tourism_fte']
+            fig = build_projection_chart(
+                scenario_df, 'tourism_employment', current_employment, "Current Employment",
+                "Tourism Employment Growth Projections", "Tourism Employment (FTE)"
+            )
+            st.plotly_chart(fig, use_container_width=True)
             
-            gdp_change = ((new_gdp - base_gdp) / base_gdp) * 100
-            emp_change = ((new_employment - base_employment) / base_employment) * 100
+            # Summary table
+            st.subheader("Growth Scenario Summary")
             
-            col1, col2, col3 = st.columns(3)
+            final_year = scenario_df[scenario_df['year'] == scenario_df['year'].max()].reset_index(drop=True)
+            gdp_growth = ((final_year['tourism_gdp'] / current_gdp) - 1) * 100
+            emp_growth = ((final_year['tourism_employment'] / current_employment) - 1) * 100
             
-            with col1:
-                st.metric("Parameter Change", f"{param_change:+.0f}%")
+            summary_df = pd.DataFrame({
+                'Scenario': final_year['scenario'],
+                f'{years_ahead}-Year GDP Growth (%)': gdp_growth.map('{:.1f}%'.format),
+                f'{years_ahead}-Year Employment Growth (%)': emp_growth.map('{:.1f}%'.format),
+                'Final GDP (€M)': final_year['tourism_gdp'].map('{:,.0f}'.format),
+                'Final Employment': final_year['tourism_employment'].map('{:,.0f}'.format)
+            })
             
-            with col2:
-                st.metric("GDP Impact", f"{gdp_change:+.1f}%")
+            st.dataframe(summary_df, hide_index=True)
+
+@st.fragment
+def render_policy_interventions(scenario_analyzer):
+    """Policy interventions panel (reruns only on its own widgets)"""
+    
+    st.subheader("Policy Intervention Analysis")
+    
+    if st.button("Analyze Policy Interventions"):
+        with st.spinner("Analyzing policy impacts..."):
+            policy_results = scenario_analyzer.analyze_policy_interventions()
+            
+            # One frame, indexed by display label, drives the chart, table and picks
+            policy_df = policy_results.set_index(
+                policy_results['policy'].str.replace('_', ' ').str.title().rename('Policy')
+            )
+            
+            # Policy comparison chart
+            fig = build_policy_chart(policy_df)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Policy details table
+            st.subheader("Policy Intervention Details")
+            
+            policy_table = pd.DataFrame({
+                'Description': policy_df['description'],
+                'GDP Change (%)': policy_df['gdp_change'].map('{:+.1f}%'.format),
+                'Employment Change (%)': policy_df['employment_change'].map('{:+.1f}%'.format),
+                'Investment Cost (€M)': policy_df['investment_cost'].map('{:.0f}'.format),
+                'ROI': policy_df['roi'].map('{:.1f}x'.format)
+            }).reset_index()
+            
+            st.dataframe(policy_table, hide_index=True)
             
-            with col3:
-                st.metric("Employment Impact", f"{emp_change:+.1f}%")
+            # Recommendations
+            st.subheader("Policy Recommendations")
             
-            st.write(f"**Interpretation**: A {param_change:+.0f}% change in {parameter.lower()} "
-                    f"results in a {gdp_change:+.1f}% change in tourism GDP and "
-                    f"a {emp_change:+.1f}% change in employment.")
+            best_roi = policy_df['roi'].idxmax()
+            best_gdp = policy_df['gdp_change'].idxmax()
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.success(f"**Highest ROI**: {best_roi}")
+                st.write(f"ROI: {policy_df.at[best_roi, 'roi']:.1f}x")
+                st.write(f"GDP Impact: {policy_df.at[best_roi, 'gdp_change']:+.1f}%")
+            
+            with col2:
+                st.info(f"**Highest GDP Impact**: {best_gdp}")
+                st.write(f"GDP Impact: {policy_df.at[best_gdp, 'gdp_change']:+.1f}%")
+                st.write(f"ROI: {policy_df.at[best_gdp, 'roi']:.1f}x")
+
+@st.fragment
+def render_sensitivity_analysis(analyzer):
+    """Sensitivity analysis panel (reruns only on its own widgets)"""
+    
+    st.subheader("Sensitivity Analysis")
+    st.write("Analyze how changes in key parameters affect tourism outcomes.")
+    
+    # Parameter selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        param_change = st.slider("Parameter Change (%)", -30, 30, 10)
+    
+    with col2:
+        parameter = st.selectbox(
+            "Select Parameter",
+            _SENSITIVITY_PARAMETERS
+        )
+    
+    if st.button("Run Sensitivity Analysis"):
+        base_gdp = analyzer.core_aggregates['tourism_direct_gdp']
+        base_employment = analyzer.core_aggregates['total_tourism_fte']
+        
+        # Simple sensitivity calculation
+        new_gdp, new_employment = _sensitivity_kernel(
+            base_gdp, base_employment, _SENSITIVITY_PARAMETERS.index(parameter), param_change
+        )
+        
+        gdp_change = ((new_gdp - base_gdp) / base_gdp) * 100
+        emp_change = ((new_employment - base_employment) / base_employment) * 100
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Parameter Change", f"{param_change:+.0f}%")
+        
+        with col2:
+            st.metric("GDP Impact", f"{gdp_change:+.1f}%")
+        
+        with col3:
+            st.metric("Employment Impact", f"{emp_change:+.1f}%")
+        
+        st.write(f"**Interpretation**: A {param_change:+.0f}% change in {parameter.lower()} "
+                f"results in a {gdp_change:+.1f}% change in tourism GDP and "
+                f"a {emp_change:+.1f}% change in employment.")
 
 def show_executive_summary():
     """Executive summary page"""
@@ -1104,6 +1595,8 @@ def show_executive_summary():
     
     analyzer = st.session_state.analyzer
     aggregates = analyzer.core_aggregates
+    kpis = analyzer.kpis
+    top_3_share = analyzer.emp_concentration['top3']
     
     st.title("📋 Executive Summary")
     st.subheader(f"Tourism Satellite Account Analysis - {analyzer.country_name}")
@@ -1116,29 +1609,28 @@ def show_executive_summary():
     with col1:
         st.metric(
             "Tourism GDP Contribution",
-            f"€{aggregates['tourism_direct_gdp']:,.0f}M",
-            f"{aggregates['tourism_gdp_share']:.1f}% of total GDP"
+            kpis['gdp'],
+            f"{kpis['gdp_share']} of total GDP"
         )
     
     with col2:
         st.metric(
             "Tourism Employment",
-            f"{aggregates['total_tourism_fte']:,.0f} jobs",
-            f"{aggregates['tourism_employment_share']:.1f}% of total employment"
+            f"{kpis['fte']} jobs",
+            f"{kpis['employment_share']} of total employment"
         )
     
     with col3:
         st.metric(
             "Tourism Consumption",
-            f"€{aggregates['internal_tourism_consumption']:,.0f}M",
-            f"€{aggregates['tourism_consumption_per_capita']:,.0f} per capita"
+            kpis['consumption'],
+            f"{kpis['consumption_per_capita']} per capita"
         )
     
     with col4:
-        avg_ratio = analyzer.tourism_ratios['Tourism_Ratio'].mean()
         st.metric(
             "Average Tourism Ratio",
-            f"{avg_ratio:.1f}%",
+            kpis['avg_ratio'],
             "Across all products"
         )
     
@@ -1176,17 +1668,17 @@ def show_executive_summary():
     with col2:
         st.subheader("🏗️ Industry Structure")
         
-        top_industry = analyzer.employment_analysis.iloc[0]
-        top_product = analyzer.tourism_ratios.iloc[0]
+        leaders = analyzer.leaders
         
-        st.write(f"**Leading employment industry**: {top_industry['Tourism_Industries']}")
-        st.write(f"Share: {top_industry['Employment_Share']:.1f}% of tourism jobs")
+        if 'industry' in leaders:
+            st.write(f"**Leading employment industry**: {leaders['industry']}")
+            st.write(f"Share: {leaders['industry_share']:.1f}% of tourism jobs")
         
-        st.write(f"**Highest tourism intensity**: {top_product['Product']}")
-        st.write(f"Tourism ratio: {top_product['Tourism_Ratio']:.1f}%")
+        if 'product' in leaders:
+            st.write(f"**Highest tourism intensity**: {leaders['product']}")
+            st.write(f"Tourism ratio: {leaders['product_ratio']:.1f}%")
         
         # Industry concentration
-        top_3_share = analyzer.employment_analysis.head(3)['Employment_Share'].sum()
         if top_3_share > 70:
             st.warning(f"⚠️ High concentration: Top 3 industries = {top_3_share:.1f}%")
         else:
@@ -1195,107 +1687,90 @@ def show_executive_summary():
     # Key findings
     st.subheader("💡 Key Findings & Recommendations")
     
-    findings = []
-    
-    # Economic impact finding
-    if aggregates['tourism_gdp_share'] > 10:
-        findings.append("🔍 **High Economic Impact**: Tourism is a major economic driver with significant GDP and employment contributions.")
-    elif aggregates['tourism_gdp_share'] < 3:
-        findings.append("🔍 **Growth Opportunity**: Tourism sector shows potential for expansion and development.")
-    else:
-        findings.append("🔍 **Balanced Development**: Tourism maintains a healthy contribution to the economy.")
+    facts = {
+        'gdp_share': aggregates['tourism_gdp_share'],
+        'productivity': aggregates['gdp_per_job'],
+        'high_ratio_products': (analyzer.tourism_ratios['Tourism_Ratio'] > 100).sum(),
+        'top_3_share': top_3_share
+    }
     
-    # Employment finding
-    productivity = aggregates['tourism_direct_gdp'] / aggregates['total_tourism_fte'] * 1000
-    if productivity > 80:
-        findings.append("💼 **High Productivity**: Tourism sector demonstrates strong labor productivity.")
-    else:
-        findings.append("💼 **Productivity Focus**: Opportunities exist to improve tourism labor productivity.")
-    
-    # Tourism ratios finding
-    high_ratio_products = (analyzer.tourism_ratios['Tourism_Ratio'] > 100).sum()
-    if high_ratio_products > 5:
-        findings.append("📈 **High Tourism Intensity**: Multiple products show very high tourism dependency.")
-    elif high_ratio_products == 0:
-        findings.append("📈 **Balanced Tourism Ratios**: No products show extreme tourism dependency.")
-    else:
-        findings.append("📈 **Moderate Intensity**: Some products show high tourism specialization.")
+    findings = [next(message for applies, message in group if applies(facts))
+                for group in FINDING_RULES]
     
-    for finding in findings:
-        st.write(finding)
+    # One markdown element per list, rather than one per item
+    st.markdown("\n\n".join(findings))
     
     # Recommendations
     st.subheader("🎯 Strategic Recommendations")
     
-    recommendations = []
-    
-    # Based on GDP share
-    if aggregates['tourism_gdp_share'] > 15:
-        recommendations.append("🛡️ **Diversification Strategy**: Reduce tourism dependency through economic diversification")
-        recommendations.append("💾 **Crisis Preparedness**: Develop robust crisis response and recovery plans")
-    elif aggregates['tourism_gdp_share'] < 5:
-        recommendations.append("🚀 **Growth Strategy**: Invest in tourism infrastructure and marketing to capture potential")
-        recommendations.append("📊 **Market Development**: Focus on developing new tourism products and markets")
+    recommendations = [message for applies, message in RECOMMENDATION_RULES if applies(facts)]
     
-    # Based on employment concentration
-    top_3_employment = analyzer.employment_analysis.head(3)['Employment_Share'].sum()
-    if top_3_employment > 70:
-        recommendations.append("🌐 **Industry Diversification**: Develop broader range of tourism industries")
-    
-    # Based on productivity
-    if productivity < 60:
-        recommendations.append("🎓 **Skills Development**: Invest in workforce training and capacity building")
-        recommendations.append("💻 **Technology Adoption**: Implement digital solutions to improve efficiency")
-    
-    # Universal recommendations
-    recommendations.extend([
-        "📈 **Continuous Monitoring**: Implement regular TSA updates for policy guidance",
-        "🌱 **Sustainable Development**: Balance tourism growth with environmental protection"
-    ])
-    
-    for i, rec in enumerate(recommendations, 1):
-        st.write(f"{i}. {rec}")
+    st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(recommendations, 1)))
     
     # Download report
     st.markdown("---")
     
     if st.button("📄 Generate Detailed Report"):
-        # Create a comprehensive text report
-        report_content = f"""
-TOURISM SATELLITE ACCOUNT EXECUTIVE SUMMARY
-Country: {analyzer.country_name}
-Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')}
-
-KEY PERFORMANCE INDICATORS
-==========================
-Tourism GDP Contribution: €{aggregates['tourism_direct_gdp']:,.0f} million ({aggregates['tourism_gdp_share']:.1f}% of total GDP)
-Tourism Employment: {aggregates['total_tourism_fte']:,.0f} FTE jobs ({aggregates['tourism_employment_share']:.1f}% of total employment)
-Tourism Consumption: €{aggregates['internal_tourism_consumption']:,.0f} million (€{aggregates['tourism_consumption_per_capita']:,.0f} per capita)
-Average Tourism Ratio: {avg_ratio:.1f}%
-
-ECONOMIC STRUCTURE
-==================
-Products Analyzed: {len(analyzer.tourism_ratios)}
-Tourism Industries: {len(analyzer.employment_analysis)}
-Top Employment Industry: {analyzer.employment_analysis.iloc[0]['Tourism_Industries']} ({analyzer.employment_analysis.iloc[0]['Employment_Share']:.1f}%)
-Highest Tourism Intensity: {analyzer.tourism_ratios.iloc[0]['Product']} ({analyzer.tourism_ratios.iloc[0]['Tourism_Ratio']:.1f}%)
-
-KEY FINDINGS
-============
-{chr(10).join(['- ' + finding.replace('🔍 ', '').replace('💼 ', '').replace('📈 ', '') for finding in findings])}
-
-STRATEGIC RECOMMENDATIONS
-=========================
-{chr(10).join([f"{i}. {rec.split(' ', 1)[1] if ' ' in rec else rec}" for i, rec in enumerate(recommendations, 1)])}
-"""
+        # One clock read, so the report and its file name agree on the date
+        now = datetime.now()
+        report_content = build_summary_report(
+            analyzer, kpis, findings, recommendations,
+            generated=now.strftime('%Y-%m-%d %H:%M')
+        )
         
         st.download_button(
             label="📥 Download Executive Summary",
             data=report_content,
-            file_name=f"TSA_Executive_Summary_{analyzer.country_name}_{pd.Timestamp.now().strftime('%Y%m%d')}.txt",
-            mime="text/plain"
+            file_name=f"TSA_Executive_Summary_{analyzer.country_name}_{now.strftime('%Y%m%d')}.txt",
+            mime="text/plain",
+            # Downloading needs no rerun, and one would drop the button again
+            on_click="ignore"
         )
 
+def build_summary_report(analyzer, kpis, findings, recommendations, generated):
+    """Plain-text executive summary report"""
+    
+    aggregates = analyzer.core_aggregates
+    leaders = analyzer.leaders
+    
+    lines = [
+        "",
+        "TOURISM SATELLITE ACCOUNT EXECUTIVE SUMMARY",
+        f"Country: {analyzer.country_name}",
+        f"Generated: {generated}",
+        "",
+        "KEY PERFORMANCE INDICATORS",
+        "==========================",
+        f"Tourism GDP Contribution: €{aggregates['tourism_direct_gdp']:,.0f} million "
+        f"({aggregates['tourism_gdp_share']:.1f}% of total GDP)",
+        f"Tourism Employment: {aggregates['total_tourism_fte']:,.0f} FTE jobs "
+        f"({aggregates['tourism_employment_share']:.1f}% of total employment)",
+        f"Tourism Consumption: €{aggregates['internal_tourism_consumption']:,.0f} million "
+        f"(€{aggregates['tourism_consumption_per_capita']:,.0f} per capita)",
+        f"Average Tourism Ratio: {kpis['avg_ratio']}",
+        "",
+        "ECONOMIC STRUCTURE",
+        "==================",
+        f"Products Analyzed: {len(analyzer.tourism_ratios)}",
+        f"Tourism Industries: {len(analyzer.employment_analysis)}",
+        *([f"Top Employment Industry: {leaders['industry']} ({leaders['industry_share']:.1f}%)"]
+          if 'industry' in leaders else []),
+        *([f"Highest Tourism Intensity: {leaders['product']} ({leaders['product_ratio']:.1f}%)"]
+          if 'product' in leaders else []),
+        "",
+        "KEY FINDINGS",
+        "============",
+        *('- ' + finding.translate(_REPORT_EMOJI_TRANS).lstrip() for finding in findings),
+        "",
+        "STRATEGIC RECOMMENDATIONS",
+        "=========================",
+        # The leading emoji is the first word of each recommendation
+        *(f"{i}. {rec.split(' ', 1)[1] if ' ' in rec else rec}"
+          for i, rec in enumerate(recommendations, 1)),
+        ""
+    ]
+    return "\n".join(lines)
+
 def show_data_validation():
     """Data validation page"""
     
@@ -1309,7 +1784,11 @@ def show_data_validation():
     st.subheader(f"Country: {analyzer.country_name}")
     
     # Run validation
-    validation_score, issues = analyzer.validate_supply_demand_balance()
+    validation_score, issues = analyzer.validation
+    tables = analyzer.validation_tables
+    total_missing = tables['total_missing']
+    n_extreme = tables['n_extreme']
+    discrepancy_pct = tables['discrepancy_pct']
     
     # Validation score display
     col1, col2, col3 = st.columns(3)
@@ -1345,53 +1824,24 @@ def show_data_validation():
     with col1:
         st.write("**Data Completeness Check**")
         
-        table4_missing = analyzer.table4['Internal_Tourism_Consumption'].isna().sum()
-        table6_missing = analyzer.table6['Tourism_Ratio_Percent'].isna().sum()
-        table7_missing = analyzer.table7['Full_Time_Equivalent_Jobs'].isna().sum()
-        
-        completeness_data = {
-            'Table': ['Table 4 (Consumption)', 'Table 6 (Supply-Demand)', 'Table 7 (Employment)'],
-            'Missing Values': [table4_missing, table6_missing, table7_missing],
-            'Total Records': [len(analyzer.table4), len(analyzer.table6), len(analyzer.table7)]
-        }
-        
-        completeness_df = pd.DataFrame(completeness_data)
-        completeness_df['Completeness %'] = ((completeness_df['Total Records'] - completeness_df['Missing Values']) / 
-                                             completeness_df['Total Records'] * 100).round(1)
-        
-        st.dataframe(completeness_df, hide_index=True)
+        st.dataframe(tables['completeness'], hide_index=True,
+                     column_config={'Completeness %': st.column_config.NumberColumn(format="%.1f")})
         
-        if table4_missing + table6_missing + table7_missing == 0:
+        if total_missing == 0:
             st.success("✅ No missing values found")
         else:
-            st.warning(f"⚠️ {table4_missing + table6_missing + table7_missing} missing values found")
+            st.warning(f"⚠️ {total_missing} missing values found")
     
     with col2:
         st.write("**Tourism Ratios Validation**")
         
-        extreme_ratios = analyzer.table6[analyzer.table6['Tourism_Ratio_Percent'] > 150]
-        high_ratios = analyzer.table6[analyzer.table6['Tourism_Ratio_Percent'] > 100]
-        reasonable_ratios = analyzer.table6[analyzer.table6['Tourism_Ratio_Percent'] <= 100]
-        
-        ratio_validation = {
-            'Ratio Category': ['Reasonable (≤100%)', 'High (100-150%)', 'Extreme (>150%)'],
-            'Count': [len(reasonable_ratios), len(high_ratios) - len(extreme_ratios), len(extreme_ratios)],
-            'Percentage': [
-                len(reasonable_ratios) / len(analyzer.table6) * 100,
-                (len(high_ratios) - len(extreme_ratios)) / len(analyzer.table6) * 100,
-                len(extreme_ratios) / len(analyzer.table6) * 100
-            ]
-        }
-        
-        ratio_df = pd.DataFrame(ratio_validation)
-        ratio_df['Percentage'] = ratio_df['Percentage'].round(1)
+        st.dataframe(tables['ratios'], hide_index=True,
+                     column_config={'Percentage': st.column_config.NumberColumn(format="%.1f")})
         
-        st.dataframe(ratio_df, hide_index=True)
-        
-        if len(extreme_ratios) == 0:
+        if n_extreme == 0:
             st.success("✅ All tourism ratios are reasonable")
         else:
-            st.warning(f"⚠️ {len(extreme_ratios)} products have extreme ratios")
+            st.warning(f"⚠️ {n_extreme} products have extreme ratios")
     
     # Consistency checks
     st.subheader("🔄 Consistency Checks")
@@ -1401,18 +1851,12 @@ def show_data_validation():
     with col1:
         st.write("**Tourism Consumption Consistency**")
         
-        table4_total = analyzer.table4['Internal_Tourism_Consumption'].sum()
-        table6_total = analyzer.table6['Internal_Tourism_Consumption'].sum()
-        discrepancy = abs(table4_total - table6_total)
-        discrepancy_pct = (discrepancy / table4_total * 100) if table4_total > 0 else 0
+        # Integer totals display as they are; only float totals get two decimals
+        consistency_config = {'Percentage': st.column_config.NumberColumn(format="%.2f")}
+        if tables['consistency']['Value (€M)'].dtype.kind == 'f':
+            consistency_config['Value (€M)'] = st.column_config.NumberColumn(format="%.2f")
         
-        consistency_data = {
-            'Source': ['Table 4 (Internal Consumption)', 'Table 6 (Supply-Demand)', 'Discrepancy'],
-            'Value (€M)': [table4_total, table6_total, discrepancy],
-            'Percentage': [100.0, (table6_total/table4_total*100) if table4_total > 0 else 0, discrepancy_pct]
-        }
-        
-        st.dataframe(pd.DataFrame(consistency_data).round(2), hide_index=True)
+        st.dataframe(tables['consistency'], hide_index=True, column_config=consistency_config)
         
         if discrepancy_pct < 1:
             st.success(f"✅ Consumption consistency: {discrepancy_pct:.2f}% difference")
@@ -1422,25 +1866,13 @@ def show_data_validation():
     with col2:
         st.write("**Table Structure Validation**")
         
-        validation_results = validate_table_structure(analyzer.tables)
-        
-        structure_data = []
-        for table, result in validation_results.items():
-            status = "✅ Valid" if "✅" in result else "❌ Invalid"
-            structure_data.append({
-                'Table': table,
-                'Status': status,
-                'Details': result
-            })
-        
-        st.dataframe(pd.DataFrame(structure_data), hide_index=True)
+        st.dataframe(tables['structure'], hide_index=True)
     
     # Issues summary
     if issues:
         st.subheader("⚠️ Validation Issues")
         
-        for i, issue in enumerate(issues, 1):
-            st.write(f"{i}. {issue}")
+        st.markdown("\n".join(f"{i}. {issue}" for i, issue in enumerate(issues, 1)))
     else:
         st.success("🎉 No validation issues found! Data quality is excellent.")
     
@@ -1450,10 +1882,10 @@ def show_data_validation():
     recommendations = []
     
     if validation_score < 100:
-        if table4_missing + table6_missing + table7_missing > 0:
+        if total_missing > 0:
             recommendations.append("📝 Address missing values in core tables")
         
-        if len(extreme_ratios) > 0:
+        if n_extreme > 0:
             recommendations.append("🔍 Review products with extreme tourism ratios (>150%)")
         
         if discrepancy_pct > 1:
@@ -1468,8 +1900,7 @@ def show_data_validation():
         recommendations.append("🌟 Maintain current high data quality standards")
         recommendations.append("📈 Consider expanding data collection for optional tables")
     
-    for i, rec in enumerate(recommendations, 1):
-        st.write(f"{i}. {rec}")
+    st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(recommendations, 1)))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file